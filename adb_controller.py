@@ -1,11 +1,20 @@
+import atexit
+import os
 import subprocess
 import platform
+import re
+import shutil
+import socket
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 
 from models import TVConfig, TVStatus, TVState, ActionResult
 from config_loader import load_config
 
 
+@lru_cache(maxsize=1)
 def get_adb_port() -> int:
     try:
         config = load_config()
@@ -14,13 +23,15 @@ def get_adb_port() -> int:
         return 5555
 
 
-def get_adb_path() -> str:
+SYSTEM_NAME = platform.system().lower()
+
+
+def find_adb_path() -> str:
     app_directory = Path(__file__).parent
-    system_name = platform.system().lower()
 
-    if system_name == "darwin":
+    if SYSTEM_NAME == "darwin":
         adb_binary = app_directory / "adb" / "mac" / "adb"
-    elif system_name == "windows":
+    elif SYSTEM_NAME == "windows":
         adb_binary = app_directory / "adb" / "windows" / "adb.exe"
     else:
         adb_binary = app_directory / "adb" / "linux" / "adb"
@@ -28,73 +39,366 @@ def get_adb_path() -> str:
     if adb_binary.exists():
         return str(adb_binary)
 
-    return "adb"
+    return shutil.which("adb") or "adb"
+
 
+ADB_PATH = find_adb_path()
+
+
+def get_adb_path() -> str:
+    return ADB_PATH
 
-def run_adb_command(args: list[str], timeout_seconds: int = 10) -> tuple[bool, str]:
-    adb_path = get_adb_path()
-    full_command = [adb_path] + args
 
+CLOSE_INHERITED_FDS = os.name == "nt"
+
+
+def decode_output(output: bytes) -> str:
+    return output.decode(errors="replace").strip()
+
+
+def run_adb_command(args: tuple[str, ...], timeout_seconds: int = 10) -> tuple[bool, bytes]:
     try:
+        # posix_spawn fast path: keep an absolute executable path and
+        # close_fds=False, and do not add preexec_fn, cwd or start_new_session.
         result = subprocess.run(
-            full_command,
+            (get_adb_path(),) + args,
             capture_output=True,
-            text=True,
+            close_fds=CLOSE_INHERITED_FDS,
             timeout=timeout_seconds
         )
-        output = result.stdout.strip() or result.stderr.strip()
-        return result.returncode == 0, output
+        return result.returncode == 0, result.stdout or result.stderr
     except subprocess.TimeoutExpired:
-        return False, "Connection timed out"
+        return False, b"Connection timed out"
     except FileNotFoundError:
-        return False, "ADB not found"
+        return False, b"ADB not found"
     except Exception as e:
-        return False, str(e)
+        return False, str(e).encode()
+
+
+SHELL_END_MARKER = b"__END__:"
+
+_shell_sessions: dict[str, subprocess.Popen] = {}
+_shell_session_locks: dict[str, threading.Lock] = {}
+_shell_sessions_lock = threading.Lock()
+
+
+def get_shell_session(address: str) -> tuple[subprocess.Popen, threading.Lock]:
+    with _shell_sessions_lock:
+        session_lock = _shell_session_locks.setdefault(address, threading.Lock())
+        process = _shell_sessions.get(address)
+
+        if process is None or process.poll() is not None:
+            process = subprocess.Popen(
+                (get_adb_path(), "-s", address, "shell"),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                close_fds=CLOSE_INHERITED_FDS
+            )
+            _shell_sessions[address] = process
+
+        return process, session_lock
+
+
+def discard_shell_session(address: str, process: subprocess.Popen) -> None:
+    with _shell_sessions_lock:
+        if _shell_sessions.get(address) is process:
+            del _shell_sessions[address]
+
+    forget_connected_device(address)
+
+    try:
+        process.kill()
+        process.wait(timeout=1)
+    except Exception:
+        pass
+
+
+def run_shell_command(address: str, command: str, timeout_seconds: int = 5) -> tuple[bool, bytes]:
+    try:
+        process, session_lock = get_shell_session(address)
+    except FileNotFoundError:
+        return False, b"ADB not found"
+    except Exception as e:
+        return False, str(e).encode()
+
+    with session_lock:
+        timed_out = threading.Event()
+
+        def on_timeout():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(timeout_seconds, on_timeout)
+        timer.start()
+        output_lines: list[bytes] = []
+
+        try:
+            process.stdin.write(command.encode() + b"\nprintf '\\n" + SHELL_END_MARKER + b"%d\\n' $?\n")
+            process.stdin.flush()
+
+            while True:
+                line = process.stdout.readline()
+                if not line:
+                    break
+
+                if line.startswith(SHELL_END_MARKER):
+                    exit_code = line[len(SHELL_END_MARKER):].strip()
+                    return exit_code == b"0", b"".join(output_lines)[:-1]
+
+                output_lines.append(line)
+        except OSError as e:
+            output_lines.append(str(e).encode())
+        finally:
+            timer.cancel()
+
+    discard_shell_session(address, process)
+
+    if timed_out.is_set():
+        return False, b"Connection timed out"
+    return False, b"".join(output_lines) or b"Shell session closed"
+
+
+def close_shell_sessions() -> None:
+    with _shell_sessions_lock:
+        processes = list(_shell_sessions.values())
+        _shell_sessions.clear()
+
+    for process in processes:
+        try:
+            process.stdin.close()
+            process.wait(timeout=2)
+        except Exception:
+            process.kill()
+
+
+atexit.register(close_shell_sessions)
+
+_adb_server_started = False
+_adb_server_lock = threading.Lock()
+
+
+def start_adb_server() -> None:
+    global _adb_server_started
+
+    with _adb_server_lock:
+        if _adb_server_started:
+            return
+        run_adb_command(("start-server",), timeout_seconds=10)
+        _adb_server_started = True
+
+
+_device_addresses: dict[str, str] = {}
+
+
+def get_device_address(ip: str) -> str:
+    address = _device_addresses.get(ip)
+    if address is None:
+        address = _device_addresses.setdefault(ip, f"{ip}:{get_adb_port()}")
+    return address
 
 
-def connect_to_tv(ip: str) -> tuple[bool, str]:
+CONNECTED_DEVICES_TTL_SECONDS = 5.0
+
+_connected_devices: set[str] = set()
+_connected_devices_checked_at = 0.0
+_connected_devices_lock = threading.Lock()
+
+
+def list_connected_devices() -> set[str]:
+    success, output = run_adb_command(("devices",), timeout_seconds=5)
+    if not success:
+        return set()
+
+    devices = set()
+    for line in output.splitlines()[1:]:
+        serial, _, device_state = line.partition(b"\t")
+        if device_state.strip() == b"device":
+            devices.add(serial.decode(errors="replace"))
+    return devices
+
+
+def is_device_connected(address: str) -> bool:
+    global _connected_devices, _connected_devices_checked_at
+
+    with _connected_devices_lock:
+        now = time.monotonic()
+        if now - _connected_devices_checked_at > CONNECTED_DEVICES_TTL_SECONDS:
+            _connected_devices = list_connected_devices()
+            _connected_devices_checked_at = now
+        return address in _connected_devices
+
+
+def forget_connected_device(address: str) -> None:
+    with _connected_devices_lock:
+        _connected_devices.discard(address)
+
+
+TCP_PROBE_TIMEOUT_SECONDS = 0.3
+
+
+def is_tcp_open(ip: str, port: int, timeout: float = TCP_PROBE_TIMEOUT_SECONDS) -> bool:
+    try:
+        with socket.create_connection((ip, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def connect_to_tv(ip: str) -> tuple[bool, bytes]:
+    address = get_device_address(ip)
+    if is_device_connected(address):
+        return True, b"already connected to " + address.encode()
+
     port = get_adb_port()
-    address = f"{ip}:{port}"
-    success, output = run_adb_command(["connect", address], timeout_seconds=5)
+    if not is_tcp_open(ip, port):
+        return False, f"port {port} not reachable".encode()
+
+    success, output = run_adb_command(("connect", address), timeout_seconds=5)
 
-    is_connected = success and ("connected" in output.lower() or "already connected" in output.lower())
+    is_connected = success and b"connected" in output.lower()
+    if is_connected:
+        with _connected_devices_lock:
+            _connected_devices.add(address)
     return is_connected, output
 
 
 def disconnect_from_tv(ip: str) -> None:
-    port = get_adb_port()
-    address = f"{ip}:{port}"
-    run_adb_command(["disconnect", address], timeout_seconds=3)
+    run_adb_command(("disconnect", get_device_address(ip)), timeout_seconds=3)
+
+
+POWER_STATE_COMMAND = "dumpsys power"
+POWER_STATE_PROTO_COMMAND = "dumpsys power --proto"
+TOGGLE_POWER_COMMAND = "input keyevent 26"
+WAKEFULNESS_PATTERN = re.compile(rb"mWakefulness=(\w+)")
+WAKEFULNESS_STATES = {
+    b"awake": TVState.AWAKE,
+    b"asleep": TVState.ASLEEP,
+    b"dozing": TVState.ASLEEP,
+}
+PROTO_WAKEFULNESS_FIELD = 3
+PROTO_WAKEFULNESS_STATES = {
+    0: TVState.ASLEEP,
+    1: TVState.AWAKE,
+    2: TVState.UNKNOWN,
+    3: TVState.ASLEEP,
+}
+
+
+def build_power_command(skip_states: str) -> str:
+    return (
+        f"power=$({POWER_STATE_COMMAND}) && "
+        "case \"$power\" in *mWakefulness=*) ;; *) false ;; esac && "
+        "state=${power#*mWakefulness=} && state=${state%%[!A-Za-z]*} && "
+        "echo \"mWakefulness=$state\" && "
+        f"case \"$state\" in {skip_states}) ;; *) {TOGGLE_POWER_COMMAND} ;; esac"
+    )
 
 
-def get_tv_power_state(ip: str) -> TVState:
-    port = get_adb_port()
-    address = f"{ip}:{port}"
-    success, output = run_adb_command(
-        ["-s", address, "shell", "dumpsys power | grep 'mWakefulness='"],
-        timeout_seconds=5
-    )
+TURN_ON_COMMAND = build_power_command("Awake")
+TURN_OFF_COMMAND = build_power_command("Asleep|Dozing")
+
+
+def read_varint(data: bytes, position: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while position < len(data) and shift < 64:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+    raise ValueError("Truncated varint")
+
+
+def parse_wakefulness_proto(data: bytes) -> str:
+    if not data:
+        raise ValueError("Empty proto dump")
+
+    wakefulness = 0
+    position = 0
+    while position < len(data):
+        key, position = read_varint(data, position)
+        field_number, wire_type = key >> 3, key & 0x07
+
+        if field_number == 0:
+            raise ValueError("Invalid field number")
+        elif wire_type == 0:
+            value, position = read_varint(data, position)
+            if field_number == PROTO_WAKEFULNESS_FIELD:
+                wakefulness = value
+        elif wire_type == 1:
+            position += 8
+        elif wire_type == 2:
+            length, position = read_varint(data, position)
+            position += length
+        elif wire_type == 5:
+            position += 4
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+
+    if position != len(data):
+        raise ValueError("Truncated proto dump")
+
+    return PROTO_WAKEFULNESS_STATES.get(wakefulness, TVState.UNKNOWN)
+
+
+def parse_power_state(output: bytes) -> str:
+    match = WAKEFULNESS_PATTERN.search(output)
+    if match is not None:
+        return WAKEFULNESS_STATES.get(match.group(1).lower(), TVState.UNKNOWN)
+
+    try:
+        return parse_wakefulness_proto(output)
+    except ValueError:
+        return TVState.UNKNOWN
+
+
+POWER_STATE_CACHE_TTL_SECONDS = 1.5
+
+_power_state_cache: dict[str, tuple[float, str]] = {}
+
+
+def get_cached_power_state(ip: str) -> str | None:
+    cached_at, state = _power_state_cache.get(ip, (0.0, None))
+    if time.monotonic() - cached_at < POWER_STATE_CACHE_TTL_SECONDS:
+        return state
+    return None
+
+
+def get_tv_power_state(ip: str) -> str:
+    state = get_cached_power_state(ip)
+    if state is not None:
+        return state
+
+    success, output = run_shell_command(get_device_address(ip), POWER_STATE_PROTO_COMMAND)
 
     if not success:
         return TVState.UNREACHABLE
 
-    output_lower = output.lower()
-    if "awake" in output_lower:
-        return TVState.AWAKE
-    elif "asleep" in output_lower or "dozing" in output_lower:
-        return TVState.ASLEEP
+    state = parse_power_state(output)
+    _power_state_cache[ip] = (time.monotonic(), state)
+    return state
 
-    return TVState.UNKNOWN
 
+def run_power_command(ip: str, command: str, target_state: str) -> tuple[str, bool, bytes]:
+    if get_cached_power_state(ip) is target_state:
+        return target_state, True, b""
 
-def send_power_toggle(ip: str) -> tuple[bool, str]:
-    port = get_adb_port()
-    address = f"{ip}:{port}"
-    success, output = run_adb_command(
-        ["-s", address, "shell", "input keyevent 26"],
-        timeout_seconds=5
-    )
-    return success, output
+    success, output = run_shell_command(get_device_address(ip), command)
+    _power_state_cache.pop(ip, None)
+
+    state_line, _, toggle_output = output.partition(b"\n")
+    if b"mWakefulness=" not in state_line:
+        return TVState.UNREACHABLE, False, output
+
+    current_state = parse_power_state(state_line)
+    if current_state is target_state:
+        _power_state_cache[ip] = (time.monotonic(), current_state)
+
+    return current_state, success, toggle_output
 
 
 def check_single_tv(config: TVConfig) -> TVStatus:
@@ -105,7 +409,7 @@ def check_single_tv(config: TVConfig) -> TVStatus:
             name=config.name,
             ip=config.ip,
             state=TVState.UNREACHABLE,
-            message=f"Could not connect: {connection_message}"
+            message=f"Could not connect: {decode_output(connection_message)}"
         )
 
     state = get_tv_power_state(config.ip)
@@ -127,12 +431,12 @@ def turn_on_single_tv(config: TVConfig) -> TVStatus:
             ip=config.ip,
             state=TVState.UNREACHABLE,
             action_result=ActionResult.FAILED,
-            message=f"Could not connect: {connection_message}"
+            message=f"Could not connect: {decode_output(connection_message)}"
         )
 
-    current_state = get_tv_power_state(config.ip)
+    current_state, toggle_success, toggle_message = run_power_command(config.ip, TURN_ON_COMMAND, TVState.AWAKE)
 
-    if current_state == TVState.AWAKE:
+    if current_state is TVState.AWAKE:
         return TVStatus(
             name=config.name,
             ip=config.ip,
@@ -141,7 +445,7 @@ def turn_on_single_tv(config: TVConfig) -> TVStatus:
             message="Already on"
         )
 
-    if current_state == TVState.UNREACHABLE:
+    if current_state is TVState.UNREACHABLE:
         return TVStatus(
             name=config.name,
             ip=config.ip,
@@ -150,15 +454,13 @@ def turn_on_single_tv(config: TVConfig) -> TVStatus:
             message="Could not read power state"
         )
 
-    toggle_success, toggle_message = send_power_toggle(config.ip)
-
     if not toggle_success:
         return TVStatus(
             name=config.name,
             ip=config.ip,
             state=current_state,
             action_result=ActionResult.FAILED,
-            message=f"Toggle failed: {toggle_message}"
+            message=f"Toggle failed: {decode_output(toggle_message)}"
         )
 
     return TVStatus(
@@ -179,12 +481,12 @@ def turn_off_single_tv(config: TVConfig) -> TVStatus:
             ip=config.ip,
             state=TVState.UNREACHABLE,
             action_result=ActionResult.FAILED,
-            message=f"Could not connect: {connection_message}"
+            message=f"Could not connect: {decode_output(connection_message)}"
         )
 
-    current_state = get_tv_power_state(config.ip)
+    current_state, toggle_success, toggle_message = run_power_command(config.ip, TURN_OFF_COMMAND, TVState.ASLEEP)
 
-    if current_state == TVState.ASLEEP:
+    if current_state is TVState.ASLEEP:
         return TVStatus(
             name=config.name,
             ip=config.ip,
@@ -193,7 +495,7 @@ def turn_off_single_tv(config: TVConfig) -> TVStatus:
             message="Already off"
         )
 
-    if current_state == TVState.UNREACHABLE:
+    if current_state is TVState.UNREACHABLE:
         return TVStatus(
             name=config.name,
             ip=config.ip,
@@ -202,15 +504,13 @@ def turn_off_single_tv(config: TVConfig) -> TVStatus:
             message="Could not read power state"
         )
 
-    toggle_success, toggle_message = send_power_toggle(config.ip)
-
     if not toggle_success:
         return TVStatus(
             name=config.name,
             ip=config.ip,
             state=current_state,
             action_result=ActionResult.FAILED,
-            message=f"Toggle failed: {toggle_message}"
+            message=f"Toggle failed: {decode_output(toggle_message)}"
         )
 
     return TVStatus(
@@ -1,6 +1,8 @@
 import json
+import socket
 from pathlib import Path
 from dataclasses import dataclass
+from functools import lru_cache
 
 from models import TVConfig
 
@@ -37,43 +39,65 @@ def create_default_config() -> None:
 
 
 def parse_tv_config(tv_data: dict, index: int, group_name: str) -> TVConfig:
-    if "name" not in tv_data:
-        raise ConfigError(f"Missing 'name' for TV at index {index} in {group_name}")
-
-    if "ip" not in tv_data:
-        raise ConfigError(f"Missing 'ip' for TV '{tv_data.get('name', 'unknown')}' in {group_name}")
+    match tv_data:
+        case {"name": name, "ip": ip}:
+            pass
+        case {"name": name}:
+            raise ConfigError(f"Missing 'ip' for TV '{name}' in {group_name}")
+        case _:
+            raise ConfigError(f"Missing 'name' for TV at index {index} in {group_name}")
 
     protocol = tv_data.get("protocol", "adb")
-    if protocol not in ("adb", "webos"):
-        raise ConfigError(
-            f"Invalid protocol '{protocol}' for TV '{tv_data['name']}' in {group_name}. "
-            f"Must be 'adb' or 'webos'"
-        )
-
     mac = tv_data.get("mac")
-    if protocol == "webos" and not mac:
-        raise ConfigError(
-            f"Missing 'mac' for WebOS TV '{tv_data['name']}' in {group_name}. "
-            f"MAC address is required for Wake-on-LAN power on"
-        )
+    broadcast = tv_data.get("broadcast")
+
+    if mac is not None and not isinstance(mac, str):
+        raise ConfigError(f"Invalid 'mac' for TV '{name}' in {group_name}: '{mac}'")
+
+    match protocol:
+        case "webos" if not mac:
+            raise ConfigError(
+                f"Missing 'mac' for WebOS TV '{name}' in {group_name}. "
+                f"MAC address is required for Wake-on-LAN power on"
+            )
+        case "adb" | "webos":
+            pass
+        case _:
+            raise ConfigError(
+                f"Invalid protocol '{protocol}' for TV '{name}' in {group_name}. "
+                f"Must be 'adb' or 'webos'"
+            )
+
+    if broadcast is not None:
+        try:
+            socket.inet_aton(broadcast)
+        except (OSError, TypeError):
+            raise ConfigError(f"Invalid 'broadcast' for TV '{name}' in {group_name}: '{broadcast}'")
 
-    return TVConfig(
-        name=tv_data["name"],
-        ip=tv_data["ip"],
-        protocol=protocol,
-        mac=mac
-    )
+    try:
+        return TVConfig(
+            name=name,
+            ip=ip,
+            protocol=protocol,
+            mac=mac,
+            broadcast=broadcast
+        )
+    except ValueError:
+        raise ConfigError(f"Invalid 'mac' for TV '{name}' in {group_name}: '{mac}'")
 
 
 def parse_tv_list(tv_list: list, group_name: str) -> list[TVConfig]:
     result = []
     for index, tv_data in enumerate(tv_list):
-        if not isinstance(tv_data, dict):
-            raise ConfigError(f"Invalid TV entry at index {index} in {group_name}: expected object")
-        result.append(parse_tv_config(tv_data, index, group_name))
+        match tv_data:
+            case dict():
+                result.append(parse_tv_config(tv_data, index, group_name))
+            case _:
+                raise ConfigError(f"Invalid TV entry at index {index} in {group_name}: expected object")
     return result
 
 
+@lru_cache(maxsize=1)
 def load_config() -> AppConfig:
     config_path = get_config_path()
 
@@ -86,8 +110,7 @@ def load_config() -> AppConfig:
         )
 
     try:
-        with open(config_path, "r") as f:
-            data = json.load(f)
+        data = json.loads(config_path.read_bytes())
     except json.JSONDecodeError as e:
         raise ConfigError(f"Invalid JSON in config.json: {e}")
 
@@ -114,3 +137,8 @@ def load_config() -> AppConfig:
         inside_tvs=inside_tvs,
         outside_tvs=outside_tvs
     )
+
+
+def reload_config() -> AppConfig:
+    load_config.cache_clear()
+    return load_config()
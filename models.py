@@ -1,18 +1,23 @@
-from dataclasses import dataclass
-from enum import Enum
+import sys
+from dataclasses import dataclass, field
+from typing import Final
 
 
-class TVState(Enum):
-    UNKNOWN = "unknown"
-    AWAKE = "awake"
-    ASLEEP = "asleep"
-    UNREACHABLE = "unreachable"
+WOL_PORT = 9
+WOL_ADDRESS = ("255.255.255.255", WOL_PORT)
 
 
-class ActionResult(Enum):
-    SUCCESS = "success"
-    FAILED = "failed"
-    SKIPPED = "skipped"
+class TVState:
+    UNKNOWN: Final[str] = sys.intern("unknown")
+    AWAKE: Final[str] = sys.intern("awake")
+    ASLEEP: Final[str] = sys.intern("asleep")
+    UNREACHABLE: Final[str] = sys.intern("unreachable")
+
+
+class ActionResult:
+    SUCCESS: Final[str] = sys.intern("success")
+    FAILED: Final[str] = sys.intern("failed")
+    SKIPPED: Final[str] = sys.intern("skipped")
 
 
 @dataclass
@@ -21,12 +26,26 @@ class TVConfig:
     ip: str
     protocol: str = "adb"
     mac: str | None = None
+    broadcast: str | None = None
+    magic_packet: bytes | None = field(default=None, init=False, repr=False, compare=False)
+    wol_address: tuple[str, int] = field(default=WOL_ADDRESS, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.mac and self.protocol == "webos":
+            mac_bytes = bytes.fromhex(self.mac.replace(":", "").replace("-", ""))
+            if len(mac_bytes) != 6:
+                raise ValueError(f"MAC address must be 6 bytes: {self.mac}")
+            self.magic_packet = b"\xff" * 6 + mac_bytes * 16
+
+        if self.broadcast:
+            self.wol_address = (self.broadcast, WOL_PORT)
 
 
 @dataclass
 class TVStatus:
     name: str
     ip: str
-    state: TVState
-    action_result: ActionResult | None = None
+    state: str
+    action_result: str | None = None
     message: str = ""
+    prompt_required: bool = False
@@ -1,8 +1,10 @@
 import sys
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading
-from typing import Callable
+import queue
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Sequence
 
 from models import TVConfig, TVStatus, TVState, ActionResult
 from config_loader import load_config, ConfigError, AppConfig
@@ -21,12 +23,29 @@ class Colors:
 
 
 STATUS_RESET_DELAY_MS = 60000
+STATUS_FLUSH_INTERVAL_MS = 50
+
+ACTION_RESULTS = (None, ActionResult.SUCCESS, ActionResult.FAILED, ActionResult.SKIPPED)
+
+STATUS_COLORS: dict[tuple[str, str | None], str] = {
+    **{(TVState.UNREACHABLE, result): Colors.RED for result in ACTION_RESULTS},
+    **{
+        (state, ActionResult.FAILED): Colors.RED
+        for state in (TVState.UNKNOWN, TVState.AWAKE, TVState.ASLEEP)
+    },
+    **{
+        (state, result): Colors.GREEN
+        for state in (TVState.AWAKE, TVState.ASLEEP)
+        for result in (None, ActionResult.SUCCESS, ActionResult.SKIPPED)
+    },
+}
 
 
 class TVIndicator:
     def __init__(self, parent: tk.Frame, config: TVConfig, row: int):
         self.config = config
         self.reset_job_id: str | None = None
+        self.current_color = Colors.GRAY
 
         self.indicator_label = tk.Label(
             parent,
@@ -58,29 +77,24 @@ class TVIndicator:
         )
         self.ip_label.grid(row=row, column=2, padx=(0, 10), pady=2, sticky="w")
 
-    def set_connecting(self) -> None:
-        self.indicator_label.config(fg=Colors.YELLOW)
+    def set_color(self, color: str) -> None:
+        if color == self.current_color:
+            return
 
-    def set_success(self) -> None:
-        self.indicator_label.config(fg=Colors.GREEN)
+        self.current_color = color
+        self.indicator_label.config(fg=color)
 
-    def set_failed(self) -> None:
-        self.indicator_label.config(fg=Colors.RED)
+    def set_connecting(self) -> None:
+        self.set_color(Colors.YELLOW)
 
     def set_unknown(self) -> None:
-        self.indicator_label.config(fg=Colors.GRAY)
+        self.set_color(Colors.GRAY)
 
     def update_from_status(self, status: TVStatus) -> None:
-        if status.state == TVState.UNREACHABLE:
-            self.set_failed()
-        elif status.action_result == ActionResult.FAILED:
-            self.set_failed()
-        elif status.state in (TVState.AWAKE, TVState.ASLEEP):
-            self.set_success()
-        elif "Accept prompt" in status.message:
-            self.set_connecting()
-        else:
-            self.set_unknown()
+        color = STATUS_COLORS.get((status.state, status.action_result))
+        if color is None:
+            color = Colors.YELLOW if status.prompt_required else Colors.GRAY
+        self.set_color(color)
 
 
 class ChurchTVController:
@@ -92,10 +106,25 @@ class ChurchTVController:
         self.root.resizable(False, False)
 
         self.indicators: dict[str, TVIndicator] = {}
+        self.indicator_keys: dict[tuple[str, str], str] = {}
         self.is_operation_running = False
-        self.reset_jobs: dict[str, str] = {}
+        self.pending_resets: dict[str, float] = {}
+        self.reset_timer_id: str | None = None
+        self.status_queue: queue.SimpleQueue[TVStatus] = queue.SimpleQueue()
+        self.are_buttons_enabled = True
+        self.operation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="operation")
+        self.all_tvs: tuple[TVConfig, ...] = tuple(config.inside_tvs) + tuple(config.outside_tvs)
 
         self.build_ui()
+        self.all_buttons = (
+            self.inside_on_btn,
+            self.inside_off_btn,
+            self.outside_on_btn,
+            self.outside_off_btn,
+            self.all_on_btn,
+            self.all_off_btn,
+            self.check_status_btn,
+        )
         self.center_window()
 
     def center_window(self) -> None:
@@ -208,9 +237,11 @@ class ChurchTVController:
         status_separator = ttk.Separator(self.root, orient="horizontal")
         status_separator.pack(fill="x", padx=20, pady=(10, 0))
 
+        self.status_text = "Status: Ready"
+        self.status_var = tk.StringVar(self.root, value=self.status_text)
         self.status_label = tk.Label(
             self.root,
-            text="Status: Ready",
+            textvariable=self.status_var,
             font=("Arial", 11),
             fg=Colors.FOREGROUND,
             bg=Colors.BACKGROUND,
@@ -244,6 +275,7 @@ class ChurchTVController:
             indicator_key = f"{group_prefix}_{config.name}"
             indicator = TVIndicator(inner_frame, config, row)
             self.indicators[indicator_key] = indicator
+            self.indicator_keys.setdefault((config.name, config.ip), indicator_key)
 
         return outer_frame
 
@@ -269,60 +301,91 @@ class ChurchTVController:
         )
         return button
 
-    def get_all_buttons(self) -> list[tk.Button]:
-        return [
-            self.inside_on_btn,
-            self.inside_off_btn,
-            self.outside_on_btn,
-            self.outside_off_btn,
-            self.all_on_btn,
-            self.all_off_btn,
-            self.check_status_btn,
-        ]
+    def get_all_buttons(self) -> tuple[tk.Button, ...]:
+        return self.all_buttons
 
-    def disable_all_buttons(self) -> None:
+    def set_buttons_enabled(self, enabled: bool) -> None:
+        if enabled == self.are_buttons_enabled:
+            return
+
+        self.are_buttons_enabled = enabled
+        state = "normal" if enabled else "disabled"
         for button in self.get_all_buttons():
-            button.config(state="disabled")
+            button.config(state=state)
+
+    def disable_all_buttons(self) -> None:
+        self.set_buttons_enabled(False)
 
     def enable_all_buttons(self) -> None:
-        for button in self.get_all_buttons():
-            button.config(state="normal")
+        self.set_buttons_enabled(True)
 
     def set_status(self, message: str) -> None:
-        self.status_label.config(text=f"Status: {message}")
+        text = f"Status: {message}"
+        if text == self.status_text:
+            return
+
+        self.status_text = text
+        self.status_var.set(text)
 
     def get_indicator_key(self, name: str, ip: str) -> str | None:
-        for key, indicator in self.indicators.items():
-            if indicator.config.name == name and indicator.config.ip == ip:
-                return key
-        return None
+        return self.indicator_keys.get((name, ip))
 
-    def set_indicators_connecting(self, tv_list: list[TVConfig]) -> None:
+    def set_indicators_connecting(self, tv_list: Sequence[TVConfig]) -> None:
         for config in tv_list:
             key = self.get_indicator_key(config.name, config.ip)
             if key and key in self.indicators:
                 self.indicators[key].set_connecting()
 
     def schedule_indicator_reset(self, key: str) -> None:
-        if key in self.reset_jobs:
-            self.root.after_cancel(self.reset_jobs[key])
+        self.pending_resets[key] = time.monotonic() + STATUS_RESET_DELAY_MS / 1000
+        if self.reset_timer_id is None:
+            self.schedule_reset_timer()
 
-        job_id = self.root.after(
-            STATUS_RESET_DELAY_MS,
-            lambda: self.reset_single_indicator(key)
-        )
-        self.reset_jobs[key] = job_id
+    def schedule_reset_timer(self) -> None:
+        next_deadline = min(self.pending_resets.values())
+        delay_ms = max(0, round((next_deadline - time.monotonic()) * 1000))
+        self.reset_timer_id = self.root.after(delay_ms, self.reset_expired_indicators)
 
-    def reset_single_indicator(self, key: str) -> None:
-        if key in self.indicators:
-            self.indicators[key].set_unknown()
-        if key in self.reset_jobs:
-            del self.reset_jobs[key]
+    def reset_expired_indicators(self) -> None:
+        self.reset_timer_id = None
+        now = time.monotonic()
+
+        expired_keys = [key for key, deadline in self.pending_resets.items() if deadline <= now]
+        for key in expired_keys:
+            del self.pending_resets[key]
+            if key in self.indicators:
+                self.indicators[key].set_unknown()
+
+        if self.pending_resets:
+            self.schedule_reset_timer()
 
     def on_tv_complete(self, status: TVStatus) -> None:
-        key = self.get_indicator_key(status.name, status.ip)
-        if key and key in self.indicators:
-            self.root.after(0, lambda: self.update_indicator_from_status(key, status))
+        self.status_queue.put(status)
+
+    def drain_status_updates(self) -> None:
+        has_updates = False
+        while True:
+            try:
+                status = self.status_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            has_updates = True
+            key = self.get_indicator_key(status.name, status.ip)
+            if key is not None:
+                self.update_indicator_from_status(key, status)
+
+        if has_updates:
+            self.root.update_idletasks()
+
+    def poll_operation(self, operation: Future, completion_message: str) -> None:
+        is_done = operation.done()
+        self.drain_status_updates()
+
+        if is_done:
+            self.on_operation_complete(completion_message)
+        else:
+            self.root.after(STATUS_FLUSH_INTERVAL_MS, self.poll_operation, operation, completion_message)
 
     def update_indicator_from_status(self, key: str, status: TVStatus) -> None:
         if key in self.indicators:
@@ -331,7 +394,7 @@ class ChurchTVController:
 
     def run_threaded_operation(
         self,
-        tv_list: list[TVConfig],
+        tv_list: Sequence[TVConfig],
         action: str,
         status_message: str,
         completion_message: str
@@ -344,17 +407,14 @@ class ChurchTVController:
         self.set_status(status_message)
         self.set_indicators_connecting(tv_list)
 
-        def run_operation():
-            execute_on_multiple_tvs(
-                tv_list,
-                action,
-                on_tv_complete=self.on_tv_complete,
-                max_workers=6
-            )
-            self.root.after(0, lambda: self.on_operation_complete(completion_message))
-
-        thread = threading.Thread(target=run_operation, daemon=True)
-        thread.start()
+        operation = self.operation_executor.submit(
+            execute_on_multiple_tvs,
+            tv_list,
+            action,
+            on_tv_complete=self.on_tv_complete,
+            collect_results=False
+        )
+        self.root.after(STATUS_FLUSH_INTERVAL_MS, self.poll_operation, operation, completion_message)
 
     def on_operation_complete(self, message: str) -> None:
         self.is_operation_running = False
@@ -378,27 +438,24 @@ class ChurchTVController:
         )
 
     def turn_all_on(self) -> None:
-        all_tvs = self.config.inside_tvs + self.config.outside_tvs
         self.run_threaded_operation(
-            all_tvs,
+            self.all_tvs,
             "on",
             "Turning on all TVs...",
             "All TVs operation complete"
         )
 
     def turn_all_off(self) -> None:
-        all_tvs = self.config.inside_tvs + self.config.outside_tvs
         self.run_threaded_operation(
-            all_tvs,
+            self.all_tvs,
             "off",
             "Turning off all TVs...",
             "All TVs operation complete"
         )
 
     def check_all_status(self) -> None:
-        all_tvs = self.config.inside_tvs + self.config.outside_tvs
         self.run_threaded_operation(
-            all_tvs,
+            self.all_tvs,
             "check",
             "Checking all TV statuses...",
             "Status check complete"
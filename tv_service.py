@@ -1,5 +1,5 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, Literal
+from typing import Callable, Literal, Sequence
 
 from models import TVConfig, TVStatus, TVState, ActionResult
 import adb_controller
@@ -26,6 +26,12 @@ def turn_off_single_tv(config: TVConfig) -> TVStatus:
 
 TVActionFunction = Callable[[TVConfig], TVStatus]
 
+# Workers spend their time blocked on adb or network I/O, so threads are cheap
+# here. ProcessPoolExecutor was considered and rejected: the work is already
+# delegated to adb subprocesses, so it would only double-fork. The pool lives
+# for the whole process and only spawns threads as a batch needs them.
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="tv")
+
 
 def get_action_function(action: Literal["on", "off", "check"]) -> TVActionFunction:
     if action == "on":
@@ -35,38 +41,77 @@ def get_action_function(action: Literal["on", "off", "check"]) -> TVActionFuncti
     return check_single_tv
 
 
+def run_action_safely(action_function: TVActionFunction, config: TVConfig) -> TVStatus:
+    try:
+        return action_function(config)
+    except Exception as e:
+        return TVStatus(
+            name=config.name,
+            ip=config.ip,
+            state=TVState.UNREACHABLE,
+            action_result=ActionResult.FAILED,
+            message=f"Error: {str(e)}"
+        )
+
+
+def wake_sleeping_webos_tvs(
+    tv_list: Sequence[TVConfig],
+    executor: ThreadPoolExecutor
+) -> tuple[Sequence[TVConfig], list[TVConfig], list[TVStatus]]:
+    webos_tvs = [config for config in tv_list if config.protocol == "webos" and config.magic_packet]
+    if not webos_tvs:
+        return tv_list, [], []
+
+    awake_flags = list(executor.map(webos_controller.is_tv_awake, [config.ip for config in webos_tvs]))
+    awake_tvs = [config for config, is_awake in zip(webos_tvs, awake_flags) if is_awake]
+    sleeping_tvs = [config for config, is_awake in zip(webos_tvs, awake_flags) if not is_awake]
+
+    sent_flags = webos_controller.send_wol_packets_bulk(
+        [(config.magic_packet, config.wol_address) for config in sleeping_tvs]
+    )
+    woken_statuses = [
+        webos_controller.build_wol_status(config, wol_success)
+        for config, wol_success in zip(sleeping_tvs, sent_flags)
+    ]
+
+    probed_ids = {id(config) for config in webos_tvs}
+    remaining_tvs = [config for config in tv_list if id(config) not in probed_ids]
+    return remaining_tvs, awake_tvs, woken_statuses
+
+
 def execute_on_multiple_tvs(
-    tv_list: list[TVConfig],
+    tv_list: Sequence[TVConfig],
     action: Literal["on", "off", "check"],
     on_tv_complete: Callable[[TVStatus], None] | None = None,
-    max_workers: int = 6
+    collect_results: bool = True
 ) -> list[TVStatus]:
     results: list[TVStatus] = []
     action_function = get_action_function(action)
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_tv = {
-            executor.submit(action_function, config): config
-            for config in tv_list
-        }
-
-        for future in as_completed(future_to_tv):
-            config = future_to_tv[future]
-
-            try:
-                status = future.result()
-            except Exception as e:
-                status = TVStatus(
-                    name=config.name,
-                    ip=config.ip,
-                    state=TVState.UNREACHABLE,
-                    action_result=ActionResult.FAILED,
-                    message=f"Error: {str(e)}"
-                )
+    if any(config.protocol == "adb" for config in tv_list):
+        adb_controller.start_adb_server()
 
+    def report(status: TVStatus) -> None:
+        if collect_results:
             results.append(status)
 
-            if on_tv_complete:
-                on_tv_complete(status)
+        if on_tv_complete:
+            on_tv_complete(status)
+
+    awake_webos_tvs: list[TVConfig] = []
+    woken_statuses: list[TVStatus] = []
+    if action == "on":
+        tv_list, awake_webos_tvs, woken_statuses = wake_sleeping_webos_tvs(tv_list, _executor)
+
+    for status in woken_statuses:
+        report(status)
+
+    futures = [_executor.submit(run_action_safely, action_function, config) for config in tv_list]
+    futures += [
+        _executor.submit(run_action_safely, webos_controller.turn_on_awake_tv, config)
+        for config in awake_webos_tvs
+    ]
+    for future in as_completed(futures):
+        report(future.result())
 
     return results
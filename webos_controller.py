@@ -1,88 +1,259 @@
+import atexit
 import json
 import socket
+import sqlite3
+import threading
+import time
 from pathlib import Path
 
 from pywebostv.connection import WebOSClient
 from pywebostv.controls import SystemControl
 
-from models import TVConfig, TVStatus, TVState, ActionResult
+from models import TVConfig, TVStatus, TVState, ActionResult, WOL_ADDRESS
+
+
+TOKENS_PATH = Path(__file__).resolve().parent / "webos_tokens.db"
+LEGACY_TOKENS_PATH = TOKENS_PATH.with_suffix(".json")
+
+_tokens_db: sqlite3.Connection | None = None
+_tokens_lock = threading.Lock()
 
 
 def get_tokens_path() -> Path:
-    return Path(__file__).parent / "webos_tokens.json"
+    return TOKENS_PATH
 
 
-def load_tokens() -> dict[str, dict]:
-    tokens_path = get_tokens_path()
-    if not tokens_path.exists():
-        return {}
+def get_legacy_tokens_path() -> Path:
+    return LEGACY_TOKENS_PATH
+
+
+def import_legacy_tokens(db: sqlite3.Connection) -> None:
     try:
-        with open(tokens_path, "r") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return {}
+        tokens = json.loads(get_legacy_tokens_path().read_bytes())
+    except (OSError, json.JSONDecodeError):
+        return
+
+    if not isinstance(tokens, dict):
+        return
+
+    with db:
+        db.executemany(
+            "INSERT OR IGNORE INTO tokens (ip, store) VALUES (?, ?)",
+            [(ip, json.dumps(store).encode()) for ip, store in tokens.items() if isinstance(store, dict)]
+        )
+
+
+def get_tokens_db() -> sqlite3.Connection:
+    global _tokens_db
+
+    if _tokens_db is None:
+        db = sqlite3.connect(get_tokens_path(), check_same_thread=False)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS tokens (ip TEXT PRIMARY KEY, store BLOB NOT NULL)")
+            import_legacy_tokens(db)
+        except BaseException:
+            db.close()
+            raise
+        _tokens_db = db
+    return _tokens_db
+
+
+def close_tokens_db() -> None:
+    global _tokens_db
+
+    with _tokens_lock:
+        if _tokens_db is not None:
+            _tokens_db.close()
+            _tokens_db = None
 
 
-def save_tokens(tokens: dict[str, dict]) -> None:
-    tokens_path = get_tokens_path()
-    with open(tokens_path, "w") as f:
-        json.dump(tokens, f, indent=2)
+atexit.register(close_tokens_db)
 
 
 def save_token_for_ip(ip: str, store: dict) -> None:
-    tokens = load_tokens()
-    tokens[ip] = store
-    save_tokens(tokens)
+    data = json.dumps(store).encode()
+    with _tokens_lock:
+        db = get_tokens_db()
+        with db:
+            db.execute("INSERT OR REPLACE INTO tokens (ip, store) VALUES (?, ?)", (ip, data))
 
 
 def get_token_for_ip(ip: str) -> dict:
-    tokens = load_tokens()
-    return tokens.get(ip, {})
+    try:
+        with _tokens_lock:
+            row = get_tokens_db().execute("SELECT store FROM tokens WHERE ip = ?", (ip,)).fetchone()
+    except sqlite3.Error:
+        return {}
+
+    return json.loads(row[0]) if row else {}
 
 
-def send_wol_packet(mac_address: str) -> bool:
+_wol_socket: socket.socket | None = None
+_wol_lock = threading.Lock()
+
+
+def get_wol_socket() -> socket.socket:
+    global _wol_socket
+
+    if _wol_socket is None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        _wol_socket = sock
+    return _wol_socket
+
+
+def send_wol_packet(magic_packet: bytes, address: tuple[str, int] = WOL_ADDRESS) -> bool:
     try:
-        mac_bytes = bytes.fromhex(mac_address.replace(":", "").replace("-", ""))
-        magic_packet = b'\xff' * 6 + mac_bytes * 16
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            sock.sendto(magic_packet, ('255.255.255.255', 9))
+        with _wol_lock:
+            get_wol_socket().sendto(magic_packet, address)
         return True
     except Exception:
         return False
 
 
-def connect_to_webos_tv(ip: str) -> tuple[WebOSClient | None, str]:
+def send_wol_packets_bulk(packets: list[tuple[bytes, tuple[str, int]]]) -> list[bool]:
+    results = []
+    with _wol_lock:
+        try:
+            sock = get_wol_socket()
+        except OSError:
+            return [False] * len(packets)
+
+        for magic_packet, address in packets:
+            try:
+                sock.sendto(magic_packet, address)
+                results.append(True)
+            except OSError:
+                results.append(False)
+    return results
+
+
+def build_wol_status(config: TVConfig, wol_success: bool) -> TVStatus:
+    if not wol_success:
+        return TVStatus(
+            name=config.name,
+            ip=config.ip,
+            state=TVState.ASLEEP,
+            action_result=ActionResult.FAILED,
+            message="Wake-on-LAN packet failed to send"
+        )
+
+    return TVStatus(
+        name=config.name,
+        ip=config.ip,
+        state=TVState.AWAKE,
+        action_result=ActionResult.SUCCESS,
+        message="Wake-on-LAN packet sent"
+    )
+
+
+CLIENT_POOL_TTL_SECONDS = 30.0
+
+_client_pool: dict[str, tuple[WebOSClient, float]] = {}
+_client_pool_lock = threading.Lock()
+
+
+def close_client(client: WebOSClient) -> None:
+    try:
+        client.close()
+    except Exception:
+        pass
+
+
+def discard_pooled_client(ip: str) -> None:
+    with _client_pool_lock:
+        entry = _client_pool.pop(ip, None)
+
+    if entry is not None:
+        close_client(entry[0])
+
+
+def reap_idle_clients() -> None:
+    now = time.monotonic()
+    with _client_pool_lock:
+        expired_ips = [
+            ip for ip, (client, created_at) in _client_pool.items()
+            if client.terminated or now - created_at >= CLIENT_POOL_TTL_SECONDS
+        ]
+        expired_clients = [_client_pool.pop(ip)[0] for ip in expired_ips]
+
+    for client in expired_clients:
+        close_client(client)
+
+
+def close_pooled_clients() -> None:
+    with _client_pool_lock:
+        clients = [client for client, _ in _client_pool.values()]
+        _client_pool.clear()
+
+    for client in clients:
+        close_client(client)
+
+
+atexit.register(close_pooled_clients)
+
+
+WEBOS_PORT = 3000
+AWAKE_PROBE_TIMEOUT_SECONDS = 0.3
+WEBOS_CONNECT_TIMEOUT_SECONDS = 5.0
+
+
+def is_tv_awake(ip: str, timeout: float = AWAKE_PROBE_TIMEOUT_SECONDS) -> bool:
+    try:
+        with socket.create_connection((ip, WEBOS_PORT), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def connect_to_webos_tv(ip: str, is_known_awake: bool = False) -> tuple[WebOSClient | None, str, bool]:
+    reap_idle_clients()
+    with _client_pool_lock:
+        entry = _client_pool.get(ip)
+    if entry is not None:
+        if is_known_awake or is_tv_awake(ip):
+            return entry[0], "Connected", False
+        discard_pooled_client(ip)
+
     store = get_token_for_ip(ip)
+    client = None
 
     try:
         client = WebOSClient(ip)
+        client.sock.settimeout(WEBOS_CONNECT_TIMEOUT_SECONDS)
         client.connect()
 
-        for status in client.register(store):
+        for status in client.register(store, timeout=WEBOS_CONNECT_TIMEOUT_SECONDS):
             if status == WebOSClient.PROMPTED:
                 save_token_for_ip(ip, store)
-                return None, "Accept prompt on TV"
+                return None, "Accept prompt on TV", True
             elif status == WebOSClient.REGISTERED:
                 save_token_for_ip(ip, store)
-                return client, "Connected"
+                with _client_pool_lock:
+                    _client_pool[ip] = (client, time.monotonic())
+                return client, "Connected", False
 
-        return None, "Registration failed"
+        close_client(client)
+        return None, "Registration failed", False
 
     except Exception as e:
-        return None, str(e)
+        if client is not None:
+            close_client(client)
+        return None, str(e), False
 
 
 def check_single_tv(config: TVConfig) -> TVStatus:
-    client, message = connect_to_webos_tv(config.ip)
+    client, message, prompt_required = connect_to_webos_tv(config.ip)
 
     if client is None:
-        if "Accept prompt" in message:
+        if prompt_required:
             return TVStatus(
                 name=config.name,
                 ip=config.ip,
                 state=TVState.UNKNOWN,
-                message=message
+                message=message,
+                prompt_required=True
             )
         return TVStatus(
             name=config.name,
@@ -91,11 +262,6 @@ def check_single_tv(config: TVConfig) -> TVStatus:
             message=f"Could not connect: {message}"
         )
 
-    try:
-        client.disconnect()
-    except Exception:
-        pass
-
     return TVStatus(
         name=config.name,
         ip=config.ip,
@@ -105,7 +271,7 @@ def check_single_tv(config: TVConfig) -> TVStatus:
 
 
 def turn_on_single_tv(config: TVConfig) -> TVStatus:
-    if not config.mac:
+    if not config.magic_packet:
         return TVStatus(
             name=config.name,
             ip=config.ip,
@@ -114,13 +280,16 @@ def turn_on_single_tv(config: TVConfig) -> TVStatus:
             message="No MAC address configured for Wake-on-LAN"
         )
 
-    client, message = connect_to_webos_tv(config.ip)
+    if is_tv_awake(config.ip):
+        return turn_on_awake_tv(config)
+
+    return build_wol_status(config, send_wol_packet(config.magic_packet, config.wol_address))
+
+
+def turn_on_awake_tv(config: TVConfig) -> TVStatus:
+    client, message, prompt_required = connect_to_webos_tv(config.ip, is_known_awake=True)
 
     if client is not None:
-        try:
-            client.disconnect()
-        except Exception:
-            pass
         return TVStatus(
             name=config.name,
             ip=config.ip,
@@ -129,46 +298,31 @@ def turn_on_single_tv(config: TVConfig) -> TVStatus:
             message="Already on"
         )
 
-    if "Accept prompt" in message:
+    if prompt_required:
         return TVStatus(
             name=config.name,
             ip=config.ip,
             state=TVState.UNKNOWN,
             action_result=ActionResult.FAILED,
-            message=message
+            message=message,
+            prompt_required=True
         )
 
-    wol_success = send_wol_packet(config.mac)
-
-    if not wol_success:
-        return TVStatus(
-            name=config.name,
-            ip=config.ip,
-            state=TVState.ASLEEP,
-            action_result=ActionResult.FAILED,
-            message="Wake-on-LAN packet failed to send"
-        )
-
-    return TVStatus(
-        name=config.name,
-        ip=config.ip,
-        state=TVState.AWAKE,
-        action_result=ActionResult.SUCCESS,
-        message="Wake-on-LAN packet sent"
-    )
+    return build_wol_status(config, send_wol_packet(config.magic_packet, config.wol_address))
 
 
 def turn_off_single_tv(config: TVConfig) -> TVStatus:
-    client, message = connect_to_webos_tv(config.ip)
+    client, message, prompt_required = connect_to_webos_tv(config.ip)
 
     if client is None:
-        if "Accept prompt" in message:
+        if prompt_required:
             return TVStatus(
                 name=config.name,
                 ip=config.ip,
                 state=TVState.UNKNOWN,
                 action_result=ActionResult.FAILED,
-                message=message
+                message=message,
+                prompt_required=True
             )
         return TVStatus(
             name=config.name,
@@ -180,12 +334,9 @@ def turn_off_single_tv(config: TVConfig) -> TVStatus:
 
     try:
         system = SystemControl(client)
-        system.power_off()
+        system.power_off(timeout=WEBOS_CONNECT_TIMEOUT_SECONDS)
     except Exception as e:
-        try:
-            client.disconnect()
-        except Exception:
-            pass
+        discard_pooled_client(config.ip)
         return TVStatus(
             name=config.name,
             ip=config.ip,
@@ -194,10 +345,7 @@ def turn_off_single_tv(config: TVConfig) -> TVStatus:
             message=f"Power off failed: {str(e)}"
         )
 
-    try:
-        client.disconnect()
-    except Exception:
-        pass
+    discard_pooled_client(config.ip)
 
     return TVStatus(
         name=config.name,